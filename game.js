@@ -13,6 +13,7 @@ class DiplomaticGame {
         this.ttsEnabled = true; // TTS toggle
         this.audioQueue = []; // Queue for TTS audio
         this.isPlayingAudio = false; // Track if audio is currently playing
+        this.playedEventAudio = new Set(); // Audio ids of event narration that has already played
         
         this.initializeGame();
         this.setupEventListeners();
@@ -30,6 +31,7 @@ class DiplomaticGame {
             
             const data = await response.json();
             this.sessionId = data.session_id;
+            this.playedEventAudio.clear();
             this.world = data.world_state;
             
             this.renderLeaders();
@@ -98,13 +100,13 @@ class DiplomaticGame {
             card.addEventListener('click', () => this.toggleEventSelection(event.eid));
             container.appendChild(card);
             
-            // Play TTS audio for new events (events with audio_base64 that haven't been played yet)
-            if (event.audio_base64 && !event.audio_played) {
+            // Play TTS audio for new events (events with audio that haven't been played yet)
+            if (event.audio_id && !this.playedEventAudio.has(event.audio_id)) {
                 // Mark as played to avoid repeating
-                event.audio_played = true;
+                this.playedEventAudio.add(event.audio_id);
                 // Add to audio queue with a delay
                 setTimeout(() => {
-                    this.playAudioFromBase64(event.audio_base64);
+                    this.playAudioFromUrl(`/api/audio/${this.sessionId}/${encodeURIComponent(event.audio_id)}`);
                 }, 1000);
             }
         });
@@ -171,7 +173,8 @@ class DiplomaticGame {
         await this.addMessage("🌍 World Agent", `Round ${this.currentRound}: Leaders are discussing the selected issues with Claude AI...`, "world-agent");
         
         try {
-            const response = await fetch('/api/conduct-round', {
+            // Streamed as NDJSON so each leader can be shown as soon as the server has them
+            const response = await fetch('/api/conduct-round/stream', {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
                 body: JSON.stringify({
@@ -181,37 +184,42 @@ class DiplomaticGame {
                 })
             });
             
-            const data = await response.json();
-            
-            if (data.error) {
+            if (!response.ok) {
+                const data = await response.json();
                 throw new Error(data.error);
             }
             
-            // Update world state
-            this.world = data.world_state;
-            this.renderLeaders();
-            
-            // Display AI responses with staggered timing
-            for (let i = 0; i < data.responses.length; i++) {
-                setTimeout(async () => {
-                    const response = data.responses[i];
-                    await this.addMessage(response.speaker, response.content, response.type);
-                    
-                    // Play TTS audio for leader responses with delay
-                    if (response.type === 'leader' && response.audio_base64) {
-                        // Add a small delay before playing audio to ensure message is displayed first
-                        setTimeout(() => {
-                            this.playAudioFromBase64(response.audio_base64);
-                        }, 500);
-                    }
-                }, (i + 1) * 2000); // Increased delay between responses
-            }
+            // Display AI responses with staggered timing, in the order they arrive
+            let shown = Promise.resolve();
+            await this.readNdjson(response, (item) => {
+                if (item.world_state) {
+                    // Update world state
+                    this.world = item.world_state;
+                    this.renderLeaders();
+                    return;
+                }
+                const message = item.response;
+                shown = shown
+                    .then(() => new Promise(resolve => setTimeout(resolve, 2000))) // Increased delay between responses
+                    .then(async () => {
+                        await this.addMessage(message.speaker, message.content, message.type);
+                        
+                        // Play TTS audio for leader responses with delay
+                        if (message.type === 'leader' && message.audio_base64) {
+                            // Add a small delay before playing audio to ensure message is displayed first
+                            setTimeout(() => {
+                                this.playAudioFromBase64(message.audio_base64);
+                            }, 500);
+                        }
+                    });
+            });
+            await shown;
             
             // Enable player input after all responses and audio
             setTimeout(async () => {
                 await this.addMessage("🌍 World Agent", "Your turn to respond, Secretary-General.", "world-agent");
                 this.setLoading(false);
-            }, data.responses.length * 2000 + 2000); // Longer delay to account for audio
+            }, 2000); // Longer delay to account for audio
             
         } catch (error) {
             console.error('Failed to conduct round:', error);
@@ -220,6 +228,30 @@ class DiplomaticGame {
         }
     }
     
+    // Calls onItem with each parsed line of an NDJSON response body as it arrives
+    async readNdjson(response, onItem) {
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffered = '';
+        while (true) {
+            const { done, value } = await reader.read();
+            buffered += decoder.decode(value || new Uint8Array(), { stream: !done });
+            const lines = buffered.split('\n');
+            buffered = lines.pop();
+            for (const line of lines) {
+                if (line.trim()) {
+                    onItem(JSON.parse(line));
+                }
+            }
+            if (done) {
+                if (buffered.trim()) {
+                    onItem(JSON.parse(buffered));
+                }
+                return;
+            }
+        }
+    }
+    
     async sendPlayerMessage() {
         const input = document.getElementById('player-message');
         const message = input.value.trim();
@@ -520,7 +552,14 @@ class DiplomaticGame {
         if (!this.ttsEnabled || !audioBase64) return;
         
         // Add to queue instead of playing immediately
-        this.audioQueue.push(audioBase64);
+        this.audioQueue.push({ base64: audioBase64 });
+        this.processAudioQueue();
+    }
+    
+    playAudioFromUrl(url) {
+        if (!this.ttsEnabled || !url) return;
+        
+        this.audioQueue.push({ url });
         this.processAudioQueue();
     }
     
@@ -529,19 +568,22 @@ class DiplomaticGame {
         
         this.isPlayingAudio = true;
         this.showAudioIndicator();
-        const audioBase64 = this.audioQueue.shift();
+        const item = this.audioQueue.shift();
         
         try {
-            // Convert base64 to audio blob
-            const audioData = atob(audioBase64);
-            const audioArray = new Uint8Array(audioData.length);
-            for (let i = 0; i < audioData.length; i++) {
-                audioArray[i] = audioData.charCodeAt(i);
+            let audioUrl = item.url;
+            if (!audioUrl) {
+                // Convert base64 to audio blob
+                const audioData = atob(item.base64);
+                const audioArray = new Uint8Array(audioData.length);
+                for (let i = 0; i < audioData.length; i++) {
+                    audioArray[i] = audioData.charCodeAt(i);
+                }
+                
+                const audioBlob = new Blob([audioArray], { type: 'audio/mp3' });
+                audioUrl = URL.createObjectURL(audioBlob);
             }
             
-            const audioBlob = new Blob([audioArray], { type: 'audio/mp3' });
-            const audioUrl = URL.createObjectURL(audioBlob);
-            
             // Create and play audio
             const audio = new Audio(audioUrl);
             
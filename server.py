@@ -1,37 +1,208 @@
 import os
+import atexit
+import logging
+import logging.handlers
+import queue
 import random
 import json
-import copy
+import functools
 import textwrap
 import re
+import uuid
+import hashlib
+import sqlite3
+import threading
 import time
-from dataclasses import dataclass, field, asdict
-from typing import Dict, List, Optional, Tuple
-from flask import Flask, request, jsonify, send_from_directory
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from flask import Flask, Response, request, jsonify, send_from_directory, stream_with_context
+from flask.json.provider import JSONProvider
 from flask_cors import CORS
+from cachetools import LRUCache, TTLCache
+import orjson
 from dotenv import load_dotenv
 from langchain_anthropic import ChatAnthropic
+from langchain_core.callbacks import BaseCallbackHandler
 from langchain.schema import SystemMessage, HumanMessage, AIMessage
+from langchain_core.pydantic_v1 import BaseModel, Field
 from google.cloud import texttospeech
 import base64
 
 # Load environment variables
 load_dotenv()
 
+# Request threads only enqueue log records; a single listener thread does the stderr writes
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+_log_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler())
+_log_listener.start()
+atexit.register(_log_listener.stop)
+logger = logging.getLogger("moderator")
+logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+# LOG_LEVEL=DEBUG also shows prompt-cache reads/writes per Claude call
+logger.setLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+logger.propagate = False
+
+class OrjsonProvider(JSONProvider):
+    """Route jsonify() and request.json through orjson"""
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS), mimetype="application/json"
+        )
+
 app = Flask(__name__, static_folder='.')
-CORS(app)
+app.json = OrjsonProvider(app)
+# Explicit allow-lists plus max_age let browsers cache the preflight for a day
+CORS(
+    app,
+    methods=["GET", "POST", "OPTIONS"],
+    allow_headers=["Content-Type", "Authorization"],
+    max_age=86400,
+)
 
 # ───── 0. LLM setup ─────
 API_KEY = os.getenv("ANTHROPIC_API_KEY")
 if not API_KEY:
     raise RuntimeError("Put ANTHROPIC_API_KEY in a .env file")
 
+class CacheUsageLogger(BaseCallbackHandler):
+    """Debug-log prompt-cache hits; token usage only reaches callbacks, not the returned message"""
+
+    def on_llm_end(self, response, **kwargs):
+        usage = (response.llm_output or {}).get("usage") or {}
+        logger.debug(
+            "prompt cache: read=%s written=%s",
+            usage.get("cache_read_input_tokens"), usage.get("cache_creation_input_tokens"),
+        )
+
 llm = ChatAnthropic(
     anthropic_api_key=API_KEY,
     model="claude-sonnet-4-20250514",
     temperature=0.7,
+    # The Anthropic SDK retries 429/5xx with exponential backoff and jitter
+    max_retries=int(os.getenv("LLM_MAX_RETRIES", "3")),
+    # Per-request cap; the SDK default of 10 minutes would pin a request thread (and its session lock)
+    timeout=float(os.getenv("LLM_TIMEOUT", "60")),
+    callbacks=[CacheUsageLogger()],
 )
 
+# Shared pool for fanning out independent Claude round-trips (one per leader)
+LLM_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="llm")
+
+# Cap on in-flight Claude requests across all sessions, so fan-outs stay under the rate limit
+LLM_CONCURRENCY = int(os.getenv("LLM_CONCURRENCY", "8"))
+LLM_SEM = threading.BoundedSemaphore(LLM_CONCURRENCY)
+
+# Marks each system block as a prompt-cache breakpoint. Anthropic only caches prefixes past
+# its minimum length (1024 tokens on Sonnet); shorter prompts are sent as normal.
+EPHEMERAL = {"type": "ephemeral"}
+
+def guarded_invoke(messages, model=None):
+    """llm.invoke (or model.invoke, for a tool-bound llm), waiting for a free slot under LLM_CONCURRENCY.
+
+    Leading SystemMessages become separate cached system blocks, so put the most
+    stable text first and anything that changes more often in a later one.
+    """
+    kwargs = {}
+    n_sys = 0
+    while n_sys < len(messages) and messages[n_sys].type == "system":
+        n_sys += 1
+    if n_sys:
+        # ChatAnthropic only accepts a plain-string system message, but an explicit
+        # system= kwarg is passed straight through, cache_control blocks and all
+        kwargs["system"] = [
+            {"type": "text", "text": m.content, "cache_control": EPHEMERAL} for m in messages[:n_sys]
+        ]
+        messages = messages[n_sys:]
+    with LLM_SEM:
+        return (model or llm).invoke(messages, **kwargs)
+
+class LLMCache:
+    """Exact-match cache of Claude replies keyed on the full message list.
+
+    Hot entries live in an in-process LRU; when a SQLite path is given, every
+    reply is also written there so hits survive a server restart.
+    """
+
+    def __init__(self, maxsize: int = 1024, path: Optional[str] = None):
+        self._mem = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS replies (key TEXT PRIMARY KEY, reply TEXT NOT NULL)")
+            self._db.commit()
+
+    @staticmethod
+    def key(messages, tag: str = "") -> str:
+        return hashlib.blake2b(orjson.dumps([tag, *((m.type, m.content) for m in messages)])).hexdigest()
+
+    def get(self, messages, tag: str = "") -> Optional[str]:
+        key = self.key(messages, tag)
+        with self._lock:
+            hit = self._mem.get(key)
+            if hit is None and self._db is not None:
+                row = self._db.execute("SELECT reply FROM replies WHERE key = ?", (key,)).fetchone()
+                if row:
+                    hit = self._mem[key] = row[0]
+        return hit
+
+    def put(self, messages, reply: str, tag: str = ""):
+        key = self.key(messages, tag)
+        with self._lock:
+            self._mem[key] = reply
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO replies VALUES (?, ?)", (key, reply))
+                self._db.commit()
+
+llm_cache = LLMCache(path=os.getenv("LLM_CACHE_PATH"))
+
+# Above this, replies are meant to vary between identical prompts, so sampled calls skip the cache
+CACHE_MAX_TEMPERATURE = 0.3
+
+def cached_invoke(messages, sampled: bool = False) -> str:
+    """llm.invoke(messages).content, served from cache when the same prompt was sent before.
+
+    Pass sampled=True for free-form generation (leader speech); those calls only use
+    the cache when the model runs at a near-deterministic temperature.
+    """
+    use_cache = not sampled or llm.temperature <= CACHE_MAX_TEMPERATURE
+    if use_cache:
+        hit = llm_cache.get(messages)
+        if hit is not None:
+            return hit
+    reply = guarded_invoke(messages).content
+    if use_cache:
+        llm_cache.put(messages, reply)
+    return reply
+
+@functools.lru_cache(maxsize=None)
+def _tool_model(schema):
+    # Forcing the one tool makes Claude answer with just the schema's field values
+    return llm.bind_tools([schema], tool_choice=schema.__name__)
+
+def structured_invoke(schema, messages) -> dict:
+    """Claude's reply as a validated `schema` (pydantic model) dict, via a forced tool call.
+
+    Cached like cached_invoke; raises if Claude's arguments don't fit the schema.
+    """
+    hit = llm_cache.get(messages, tag=schema.__name__)
+    if hit is not None:
+        return orjson.loads(hit)
+    reply = guarded_invoke(messages, model=_tool_model(schema))
+    result = schema.parse_obj(reply.tool_calls[0]["args"]).dict()
+    llm_cache.put(messages, dumps(result), tag=schema.__name__)
+    return result
+
 # ───── TTS setup ─────
 tts_client = None
 try:
@@ -40,11 +211,11 @@ try:
     if os.path.exists(credentials_path):
         os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = credentials_path
         tts_client = texttospeech.TextToSpeechClient()
-        print("✅ TTS service initialized successfully")
+        logger.info("✅ TTS service initialized successfully")
     else:
-        print("⚠️ TTS credentials file not found, TTS will be disabled")
+        logger.warning("⚠️ TTS credentials file not found, TTS will be disabled")
 except Exception as e:
-    print(f"⚠️ Failed to initialize TTS service: {e}")
+    logger.warning("⚠️ Failed to initialize TTS service: %s", e)
 
 # Voice mapping for different speakers
 VOICE_MAPPING = {
@@ -55,15 +226,61 @@ VOICE_MAPPING = {
     "default": "en-US-Neural2-F"       # Default voice
 }
 
+# Google TTS calls are independent network round-trips, so clips for a round are synthesized together
+TTS_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="tts")
+
 # ───── Helpers ─────
 TRAIT_NAMES = ["honest", "ambitious", "empathetic", "diplomatic", "ruthless"]
-rand01 = lambda: round(random.uniform(0.1, 1.0), 1)
+
+def rand01s(k: int) -> List[float]:
+    """k random values in [0.1, 1.0], rounded to one decimal"""
+    uniform = random.uniform
+    return [round(uniform(0.1, 1.0), 1) for _ in range(k)]
+
+def clamp(x: float, lo: float, hi: float) -> float:
+    return lo if x < lo else hi if x > hi else x
+
+_json_decoder = json.JSONDecoder()
+
+def dumps(obj) -> str:
+    """Compact JSON text for LLM payloads (orjson is several times faster than json.dumps)"""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
 
 def extract_json(blob: str) -> dict:
-    match = re.search(r"\{.*\}", blob, re.S)
-    if not match:
-        raise ValueError("No JSON object found in LLM response")
-    return json.loads(match.group(0))
+    """Return the first complete JSON object in an LLM reply, ignoring any prose around it"""
+    # Most replies are bare JSON, which orjson parses in one C call
+    try:
+        obj = orjson.loads(blob)
+        if isinstance(obj, dict):
+            return obj
+    except orjson.JSONDecodeError:
+        pass
+    start = blob.find("{")
+    while start != -1:
+        try:
+            obj, _ = _json_decoder.raw_decode(blob, start)
+            if isinstance(obj, dict):
+                return obj
+        except ValueError:
+            pass
+        start = blob.find("{", start + 1)
+    raise ValueError("No JSON object found in LLM response")
+
+@functools.lru_cache(maxsize=64)
+def tts_config(
+    voice_name: str, language_code: str = "en-US", speaking_rate: float = 1.3
+) -> Tuple["texttospeech.VoiceSelectionParams", "texttospeech.AudioConfig"]:
+    """Voice and audio protobufs for a voice/rate, built once and reused across requests"""
+    voice = texttospeech.VoiceSelectionParams(language_code=language_code, name=voice_name)
+    audio_config = texttospeech.AudioConfig(
+        audio_encoding=texttospeech.AudioEncoding.MP3,
+        speaking_rate=speaking_rate
+    )
+    return voice, audio_config
+
+def synthesize_tts_batch(items: Iterable[Tuple[str, str]]) -> List[Optional[str]]:
+    """synthesize_tts over (text, speaker) pairs concurrently, results in input order"""
+    return list(TTS_POOL.map(lambda item: synthesize_tts(*item), items))
 
 def synthesize_tts(text: str, speaker: str = "default", voice_name: str = None) -> Optional[str]:
     """Generate TTS audio for text and return base64 encoded audio"""
@@ -76,14 +293,7 @@ def synthesize_tts(text: str, speaker: str = "default", voice_name: str = None)
     
     try:
         synthesis_input = texttospeech.SynthesisInput(text=text)
-        voice = texttospeech.VoiceSelectionParams(
-            language_code="en-US",
-            name=voice_name
-        )
-        audio_config = texttospeech.AudioConfig(
-            audio_encoding=texttospeech.AudioEncoding.MP3,
-            speaking_rate=1.3
-        )
+        voice, audio_config = tts_config(voice_name)
         
         response = tts_client.synthesize_speech(
             input=synthesis_input, voice=voice, audio_config=audio_config
@@ -91,7 +301,7 @@ def synthesize_tts(text: str, speaker: str = "default", voice_name: str = None)
         
         return base64.b64encode(response.audio_content).decode('utf-8')
     except Exception as e:
-        print(f"TTS synthesis failed for {speaker}: {e}")
+        logger.warning("TTS synthesis failed for %s: %s", speaker, e)
         return None
 
 # ───── 2. Data classes ─────
@@ -105,6 +315,30 @@ class Leader:
     war_power: float
     population: int
     backstory: str
+    # Traits are fixed once rolled, so the strongest one is worked out here rather than per round
+    dominant_trait: str = field(init=False)
+
+    def __post_init__(self):
+        self.dominant_trait = max(self.traits.items(), key=lambda x: x[1])[0]
+
+    def to_dict(self) -> dict:
+        # Hand-written instead of dataclasses.asdict, which deep-copies every field
+        return {
+            "code": self.code,
+            "name": self.name,
+            "age": self.age,
+            "traits": self.traits,
+            "econ_power": self.econ_power,
+            "war_power": self.war_power,
+            "population": self.population,
+            "backstory": self.backstory,
+            "dominant_trait": self.dominant_trait,
+        }
+
+    @functools.cached_property
+    def traits_str(self) -> str:
+        """Traits as prompt text, e.g. "honest=0.4, ambitious=0.9, ..." """
+        return ", ".join(f"{k}={v}" for k, v in self.traits.items())
 
 @dataclass
 class Country:
@@ -112,6 +346,9 @@ class Country:
     leader: Leader
     relationships: Dict[str, float]
 
+    def to_dict(self) -> dict:
+        return {"code": self.code, "leader": self.leader.to_dict(), "relationships": self.relationships}
+
 @dataclass
 class Event:
     eid: str
@@ -122,134 +359,274 @@ class Event:
     resolved: bool = False
     addressed: bool = False
     audio_base64: Optional[str] = None
+    # Session-unique handle for the clip; eids can repeat once an event has ended
+    audio_id: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        """Every field but the TTS clip, which is kilobytes of base64 and served separately"""
+        return {
+            "eid": self.eid,
+            "title": self.title,
+            "description": self.description,
+            "e_type": self.e_type,
+            "cycles_alive": self.cycles_alive,
+            "resolved": self.resolved,
+            "addressed": self.addressed,
+        }
 
 @dataclass
 class WorldState:
     countries: Dict[str, Country] = field(default_factory=dict)
     events: List[Event] = field(default_factory=list)
     meeting_number: int = 0
+    # Lower-cased titles of the live events, kept in step with `events` for O(1) duplicate checks
+    titles: Set[str] = field(default_factory=set, repr=False)
+
+    def add_event(self, e: Event):
+        self.events.append(e)
+        self.titles.add(e.title.lower())
+
+    def set_events(self, events: List[Event]):
+        """Replace the event list (titles may have changed, e.g. after evolving)"""
+        self.events = events
+        self.titles = {e.title.lower() for e in events}
+
+# Schemas for replies Claude returns as forced tool calls (see structured_invoke)
+class NewEvent(BaseModel):
+    """A new world event"""
+    eid: str
+    title: str
+    description: str
+    e_type: str = Field(description="conflict, disaster, economic, ...")
+
+class Resolution(BaseModel):
+    """Whether the meeting resolved the event"""
+    resolved: bool
+
+class StatDelta(BaseModel):
+    econ: float = 0.0
+    war: float = 0.0
+    pop: int = 0
+
+class RelationshipChange(BaseModel):
+    a: str = Field(description="country code")
+    b: str = Field(description="country code")
+    delta: float
+
+class MeetingOutcomes(BaseModel):
+    """Immediate consequences of the meeting"""
+    stat_changes: Dict[str, StatDelta] = Field(description="keyed by country code")
+    relationship_changes: List[RelationshipChange]
+    summary: str = Field(description="Brief explanation of key outcomes")
 
 # ───── 3. World generation ─────
-def generate_leader(code: str) -> Leader:
-    traits = {t: rand01() for t in TRAIT_NAMES}
-    name = f"Leader_{code}"
-    age = random.randint(40, 65)
-    econ = rand01()
-    war = rand01()
+BIO_SYSTEM = SystemMessage(
+    content="Write a 3-sentence bio for a fictional head of state. Try to make a unique response."
+)
+
+def _leader_stub(code: str) -> Leader:
+    """A leader with every stat rolled but no backstory yet"""
+    traits = dict(zip(TRAIT_NAMES, rand01s(len(TRAIT_NAMES))))
+    econ, war = rand01s(2)
     pop = random.randint(5, 300) * 1_000_000
+    return Leader(code, f"Leader_{code}", random.randint(40, 65), traits, econ, war, pop, "")
 
-    traits_str = ", ".join(f"{k}={v}" for k, v in traits.items())
+def _generate_bio(leader: Leader) -> str:
     bio_prompt = [
-        SystemMessage(content="Write a 3-sentence bio for a fictional head of state. Try to make a unique response."),
-        HumanMessage(content=f"Bio for {name}, age {age}, country {code}. Traits: {traits_str}"),
+        BIO_SYSTEM,
+        HumanMessage(content=f"Bio for {leader.name}, age {leader.age}, country {leader.code}. Traits: {leader.traits_str}"),
     ]
     try:
-        bio = llm.invoke(bio_prompt).content.strip()
+        return guarded_invoke(bio_prompt).content.strip()
     except Exception:
-        bio = f"Leader of country {code}, known for their {max(traits.items(), key=lambda x: x[1])[0]} approach to governance."
-    
-    return Leader(code, name, age, traits, econ, war, pop, bio)
+        return f"Leader of country {leader.code}, known for their {leader.dominant_trait} approach to governance."
+
+def generate_bios(stubs: List[Leader]) -> List[str]:
+    """One bio per stub; the Claude calls are independent, so all are in flight at once"""
+    return list(LLM_POOL.map(_generate_bio, stubs))
 
 def init_world(n: int = 3) -> WorldState:
     world = WorldState()
     codes = [chr(ord("A") + i) for i in range(n)]
-    for c in codes:
-        world.countries[c] = Country(c, generate_leader(c), {})
-    for i, ci in enumerate(codes):
-        for cj in codes[i + 1:]:
-            w = rand01()
-            world.countries[ci].relationships[cj] = w
-            world.countries[cj].relationships[ci] = w
+    stubs = [_leader_stub(c) for c in codes]
+    for leader, bio in zip(stubs, generate_bios(stubs)):
+        leader.backstory = bio
+        world.countries[leader.code] = Country(leader.code, leader, {})
+    pairs = [(ci, cj) for i, ci in enumerate(codes) for cj in codes[i + 1:]]
+    for (ci, cj), w in zip(pairs, rand01s(len(pairs))):
+        world.countries[ci].relationships[cj] = w
+        world.countries[cj].relationships[ci] = w
     return world
 
 # ───── 4. Leader agent ─────
+# Static instructions come first in every leader prompt so the bytes Claude sees
+# are identical across leaders and rounds up to the per-leader details
+LEADER_PREAMBLE = (
+    "This is a fictional simulation between world leaders. Peaceful resolutions and threats of violence are equally allowed.\n"
+    "Speak first-person, ≤3 sentences. Never mention being an AI. When referring to other leaders, use 'leader A', 'leader B', etc. When referring to other countries, use 'country A', 'country B', etc.\n"
+)
+ROUND_PREAMBLE = (
+    LEADER_PREAMBLE
+    + "You voice each leader below, speaking only from that leader's traits and relationships.\n"
+    'Respond only JSON keyed by country code, e.g. {"A": "...", "B": "..."}.\n\n'
+)
+
+MEMORY_WINDOW = 6      # most turns each leader keeps verbatim (and sends to Claude)
+MEMORY_KEEP = 2        # turns left verbatim when the older ones are folded into the digest
+SUMMARY_CHARS = 1500   # cap on the digest of older turns
+
+# Canned lines for when Claude is unreachable, keyed by dominant trait
+FALLBACK_RESPONSES = {
+    "honest": "We must address these issues with complete transparency.",
+    "ambitious": "This is an opportunity for decisive action.",
+    "empathetic": "We must consider all those affected by these crises.",
+    "diplomatic": "I believe we can find common ground through dialogue.",
+    "ruthless": "We will do whatever is necessary to protect our interests."
+}
+DEFAULT_FALLBACK_RESPONSE = "We must work together on these challenges."
+
+class ConversationMemory:
+    """Shared record of the talks: the latest turns verbatim, older ones folded into a bounded digest.
+
+    Entries are (speaker, text) where speaker is a leader name, or "" for the player.
+    """
+
+    def __init__(self, window: int = MEMORY_WINDOW):
+        self.window = window
+        self.recent: Deque[Tuple[str, str]] = deque()
+        self.summary = ""
+
+    def append(self, entry: Tuple[str, str]):
+        if len(self.recent) >= self.window:
+            self._fold()
+        self.recent.append(entry)
+
+    def extend(self, entries: Iterable[Tuple[str, str]]):
+        for entry in entries:
+            self.append(entry)
+
+    def _fold(self):
+        # Fold several turns at once: the digest is sent as its own cached prompt block,
+        # so it should only change every few turns rather than on each one
+        lines = []
+        while len(self.recent) > MEMORY_KEEP:
+            speaker, text = self.recent.popleft()
+            lines.append(f"{speaker} said: {text}" if speaker else text)
+        self.summary = " ".join([self.summary, *lines]).strip()[-SUMMARY_CHARS:]
+
+    def __len__(self):
+        return len(self.recent)
+
 class LeaderAgent:
-    def __init__(self, country: Country):
+    def __init__(self, country: Country, memory: ConversationMemory):
         self.country = country
-        self.memory: List[Tuple[str, str]] = []
+        self.memory = memory  # shared with every leader in the session
+        # Everything up to the relationships is fixed once the leader is generated
+        l, code = country.leader, country.code
+        self._system_prefix = (
+            LEADER_PREAMBLE + f"You are {l.name}, leader of country {code}.\nTraits: {l.traits_str}. "
+        )
+        self._persona_prefix = f"Leader {code} ({l.name}, leader of country {code}).\nTraits: {l.traits_str}. "
+        # Relationships only move in end_meeting, which calls invalidate()
+        self._sys_cache: Optional[SystemMessage] = None
+        self._persona_cache: Optional[str] = None
+
+    def invalidate(self):
+        """Drop the cached prompts after this country's relationships change"""
+        self._sys_cache = None
+        self._persona_cache = None
+
+    def _relationships(self) -> str:
+        return ", ".join(f"country {k}:{v:.1f}" for k, v in self.country.relationships.items()) or "none"
 
     def _system(self) -> SystemMessage:
-        l = self.country.leader
-        rels = ", ".join(f"country {k}:{v:.1f}" for k, v in self.country.relationships.items()) or "none"
-        traits = ", ".join(f"{k}={v}" for k, v in l.traits.items())
-        return SystemMessage(
-            content=(
-                "This is a fictional simulation between world leaders. Peaceful resolutions and threats of violence are equally allowed.\n"
-                f"You are {l.name}, leader of country {self.country.code}.\n"
-                f"Traits: {traits}. Relationships: {rels}.\n"
-                "Speak first-person, ≤3 sentences. Never mention being an AI. When referring to other leaders, use 'leader A', 'leader B', etc. When referring to other countries, use 'country A', 'country B', etc."
+        if self._sys_cache is None:
+            self._sys_cache = SystemMessage(
+                content=self._system_prefix + f"Relationships: {self._relationships()}."
             )
-        )
+        return self._sys_cache
+
+    def persona(self) -> str:
+        """One-paragraph brief of this leader for prompts that voice several leaders at once"""
+        if self._persona_cache is None:
+            self._persona_cache = self._persona_prefix + f"Relationships: {self._relationships()}."
+        return self._persona_cache
+
+    def _earlier(self) -> List[SystemMessage]:
+        """The folded digest as a second system block, cached separately from the persona"""
+        if not self.memory.summary:
+            return []
+        return [SystemMessage(content=f"Earlier in these talks: {self.memory.summary}")]
 
     def _history(self):
+        name = self.country.leader.name
         return [
-            HumanMessage(content=t) if r == "user" else AIMessage(content=t)
-            for r, t in self.memory[-6:]
+            AIMessage(content=text) if speaker == name
+            else HumanMessage(content=f"{speaker} said: {text}" if speaker else text)
+            for speaker, text in self.memory.recent
         ]
 
     def speak(self, focus_events: List[Event], rnd: int) -> str:
         event_titles = "; ".join(e.title for e in focus_events)
         prompt = [
             self._system(),
+            *self._earlier(),
             *self._history(),
             HumanMessage(
                 content=f"Round {rnd}: Headlines → {event_titles}. Respond in ≤3 sentences."
             ),
         ]
         try:
-            reply = llm.invoke(prompt).content.strip()
-            self.memory.append(("assistant", reply))
-            return reply
+            return cached_invoke(prompt, sampled=True).strip()
         except Exception as e:
             # Fallback response
-            dominant_trait = max(self.country.leader.traits.items(), key=lambda x: x[1])[0]
-            fallback_responses = {
-                "honest": "We must address these issues with complete transparency.",
-                "ambitious": "This is an opportunity for decisive action.",
-                "empathetic": "We must consider all those affected by these crises.",
-                "diplomatic": "I believe we can find common ground through dialogue.",
-                "ruthless": "We will do whatever is necessary to protect our interests."
-            }
-            return fallback_responses.get(dominant_trait, "We must work together on these challenges.")
+            return FALLBACK_RESPONSES.get(self.country.leader.dominant_trait, DEFAULT_FALLBACK_RESPONSE)
 
 # ───── 5. Event agent ─────
 class EventAgent:
     MAX_EVENTS = 3
+    MAX_ATTEMPTS = 5
+    GENERATE_SYSTEM = SystemMessage(
+        content="You are WORLD-AI. Create diverse events: conflicts, disasters, economic issues. Some wild examples include: assassinations, coups, or stock market crash."
+        "No duplicate titles."
+    )
+    EVOLVE_ALL_SYSTEM = SystemMessage(
+        content='Advance every event 6 months. Respond only JSON {"events":[{title,description,resolved}, ...]}, one object per input event, order preserved.'
+    )
+    EVOLVE_SYSTEM = SystemMessage(content="Advance 6 months; JSON {title,description,resolved}.")
 
     def generate_multiple(self, w: WorldState) -> List[Event]:
         events = []
-        exist = {e.title.lower() for e in w.events}
-        
-        for attempt in range(5):
-            if len(events) >= self.MAX_EVENTS:
-                break
-                
+        exist = set(w.titles)
+        taken_ids = {e.eid for e in w.events}
+        countries = {
+            k: {
+                "econ": w.countries[k].leader.econ_power,
+                "war": w.countries[k].leader.war_power,
+                "relations": w.countries[k].relationships,
+            }
+            for k in w.countries
+        }
+        attempts = 0
+
+        # Request every missing event concurrently, then retry only the shortfall
+        while len(events) < self.MAX_EVENTS and attempts < self.MAX_ATTEMPTS:
+            wave = min(self.MAX_EVENTS - len(events), self.MAX_ATTEMPTS - attempts)
+            attempts += wave
             ctx = {
-                "countries": {
-                    k: {
-                        "econ": w.countries[k].leader.econ_power,
-                        "war": w.countries[k].leader.war_power,
-                        "relations": w.countries[k].relationships,
-                    }
-                    for k in w.countries
-                },
+                "countries": countries,
                 "active_events": list(exist),
                 "existing_titles": [e.title for e in events],
             }
-            sys = SystemMessage(
-                content=textwrap.dedent(
-                    "You are WORLD-AI. Create diverse events: conflicts, disasters, economic issues. Some wild examples include: assassinations, coups, or stock market crash."
-                    "No duplicate titles. Respond only JSON {eid,title,description,e_type}."
-                )
-            )
-            try:
-                raw = llm.invoke([sys, HumanMessage(content=json.dumps(ctx))]).content
-                d = extract_json(raw)
-                if d["title"].lower() not in exist and d["title"] not in [e.title for e in events]:
-                    events.append(Event(d["eid"], d["title"], d["description"], d["e_type"]))
-                    exist.add(d["title"].lower())
-            except Exception:
-                pass
+            prompt = [self.GENERATE_SYSTEM, HumanMessage(content=dumps(ctx))]
+            for d in LLM_POOL.map(self._candidate, [prompt] * wave):
+                if d is None or d["title"].lower() in exist or len(events) >= self.MAX_EVENTS:
+                    continue
+                # Parallel candidates see the same context, so Claude may hand out the same id twice
+                eid = d["eid"] if d["eid"] not in taken_ids else f"{d['eid']}-{len(w.events) + len(events) + 1}"
+                events.append(Event(eid, d["title"], d["description"], d["e_type"]))
+                exist.add(d["title"].lower())
+                taken_ids.add(eid)
         
         # Fallback events if AI generation fails
         # FIX THIS
@@ -264,15 +641,46 @@ class EventAgent:
         
         return events
 
+    @staticmethod
+    def _candidate(prompt) -> Optional[dict]:
+        try:
+            # Not structured_invoke: every candidate must be a fresh draw, never a cache hit
+            reply = guarded_invoke(prompt, model=_tool_model(NewEvent))
+            return NewEvent.parse_obj(reply.tool_calls[0]["args"]).dict()
+        except Exception:
+            return None
+
+    def evolve_all(self, events: List[Event], w: WorldState):
+        """Advance every event with one Claude call, falling back to evolve() per event"""
+        if not events:
+            return
+        ctx = {
+            "events": [e.to_dict() for e in events],
+            "relations": {k: c.relationships for k, c in w.countries.items()},
+            "cycles": [e.cycles_alive for e in events],
+        }
+        try:
+            raw = cached_invoke([self.EVOLVE_ALL_SYSTEM, HumanMessage(content=dumps(ctx))])
+            updates = extract_json(raw)["events"]
+            if len(updates) != len(events) or not all(isinstance(d, dict) for d in updates):
+                raise ValueError("Evolved event list does not match the input events")
+        except Exception:
+            for e in events:
+                self.evolve(e, w)
+            return
+        for e, d in zip(events, updates):
+            e.title = d.get("title", e.title)
+            e.description = d.get("description", e.description)
+            e.resolved = bool(d.get("resolved", e.resolved))
+
     def evolve(self, e: Event, w: WorldState):
         ctx = {
-            "event": asdict(e),
+            "event": e.to_dict(),
             "relations": {k: c.relationships for k, c in w.countries.items()},
             "cycles": e.cycles_alive,
         }
-        sys = SystemMessage(content="Advance 6 months; JSON {title,description,resolved}.")
         try:
-            raw = llm.invoke([sys, HumanMessage(content=json.dumps(ctx))]).content
+            raw = cached_invoke([self.EVOLVE_SYSTEM, HumanMessage(content=dumps(ctx))])
             d = extract_json(raw)
             e.title = d.get("title", e.title)
             e.description = d.get("description", e.description)
@@ -284,18 +692,43 @@ class EventAgent:
 
 # ───── 6. Resolution & Summary agents ─────
 class ResolutionAgent:
+    MIN_LOG_CHARS = 200
+    # A meeting that never touches on any of these can't have settled anything
+    RESOLUTION_HINTS = re.compile(
+        r"agree|accord|ceasefire|compromise|deal|pact|resolv|settle|treaty|truce", re.I
+    )
+    SYSTEM = SystemMessage(content="Was this event resolved in the meeting?")
+
+    def decide(self, evt: Event, log: str) -> bool:
+        if len(log) < self.MIN_LOG_CHARS or not self.RESOLUTION_HINTS.search(log):
+            return False
+        # Repeat questions are answered from llm_cache by structured_invoke
+        return self._ask(evt, log)
+
     @staticmethod
-    def decide(evt: Event, log: str) -> bool:
+    def _ask(evt: Event, log: str) -> bool:
         try:
-            raw = llm.invoke([
-                SystemMessage(content='Return JSON {"resolved":true/false}'),
-                HumanMessage(content=log[-8000:]),
-            ]).content
-            return extract_json(raw).get("resolved", False)
+            return structured_invoke(Resolution, [
+                ResolutionAgent.SYSTEM,
+                HumanMessage(content=f"Event: {evt.title}\n\n{log[-8000:]}"),
+            ])["resolved"]
         except Exception:
             return random.random() < 0.4  # 40% chance fallback
 
 class MeetingOutcomeAnalyzer:
+    SYSTEM = SystemMessage(content=textwrap.dedent("""
+        Analyze the diplomatic meeting transcript and determine immediate consequences.
+        Consider:
+        - Alliances formed or broken
+        - Threats made or received
+        - Economic cooperation or sanctions
+        - Military posturing
+        - Diplomatic wins or losses
+        
+        Use small values (0.01 to 0.15 for econ/war, 0 to ±5M for population).
+        Positive values = benefits, negative = penalties.
+    """))
+
     @staticmethod
     def analyze_meeting_outcomes(world: WorldState, transcript: str) -> Dict:
         countries = list(world.countries.keys())
@@ -312,37 +745,14 @@ class MeetingOutcomeAnalyzer:
             "active_events": [e.title for e in world.events]
         }
         
-        sys = SystemMessage(content=textwrap.dedent("""
-            Analyze the diplomatic meeting transcript and determine immediate consequences.
-            Consider:
-            - Alliances formed or broken
-            - Threats made or received
-            - Economic cooperation or sanctions
-            - Military posturing
-            - Diplomatic wins or losses
-            
-            Return JSON with immediate stat changes:
-            {
-                "stat_changes": {
-                    "A": {"econ": 0.05, "war": -0.02, "pop": 0},
-                    "B": {"econ": 0.03, "war": 0.01, "pop": 0},
-                    "C": {"econ": -0.08, "war": 0.05, "pop": -1000000}
-                },
-                "relationship_changes": [
-                    ["A", "B", 0.1],
-                    ["A", "C", -0.15],
-                    ["B", "C", -0.1]
-                ],
-                "summary": "Brief explanation of key outcomes"
-            }
-            
-            Use small values (0.01 to 0.15 for econ/war, 0 to ±5M for population).
-            Positive values = benefits, negative = penalties.
-        """))
-        
         try:
-            raw = llm.invoke([sys, HumanMessage(content=json.dumps(context))]).content
-            result = extract_json(raw)
+            result = structured_invoke(
+                MeetingOutcomes, [MeetingOutcomeAnalyzer.SYSTEM, HumanMessage(content=dumps(context))]
+            )
+            # end_meeting applies relationship changes as (a, b, delta) triples
+            result["relationship_changes"] = [
+                [r["a"], r["b"], r["delta"]] for r in result["relationship_changes"]
+            ]
             return result
         except Exception:
             # Fallback: minimal random changes
@@ -360,88 +770,175 @@ class MeetingOutcomeAnalyzer:
 class GameSession:
     def __init__(self):
         self.world = init_world(3)
-        self.leaders = {k: LeaderAgent(c) for k, c in self.world.countries.items()}
+        self.memory = ConversationMemory()
+        self.leaders = {k: LeaderAgent(c, self.memory) for k, c in self.world.countries.items()}
         self.event_agent = EventAgent()
         self.resolution = ResolutionAgent()
         self.outcome_analyzer = MeetingOutcomeAnalyzer()
         self.spawned = 0
         self.resolved = 0
         self.transcript = []
+        # Requests for one game run one at a time; different games still run in parallel
+        self.lock = threading.Lock()
+        # Serialized world state, rebuilt piecewise: "country:<code>" entries or "events" when stale
+        self._country_state: Dict[str, dict] = {}
+        self._event_state: List[dict] = []
+        self._dirty: Set[str] = {"events", *(f"country:{k}" for k in self.world.countries)}
+        # (meeting number, base64 MP3) of the latest outcome summary, served from /api/audio
+        self._meeting_audio: Optional[Tuple[int, str]] = None
+        self._audio_seq = 0
         self._generate_initial_events()
 
     def _generate_initial_events(self):
-        new_events = self.event_agent.generate_multiple(self.world)
+        self._add_events(self.event_agent.generate_multiple(self.world))
+
+    def _add_events(self, new_events: List[Event]):
+        # Skip titles already live or earlier in this batch (fallback events repeat often)
+        fresh, seen = [], set(self.world.titles)
         for event in new_events:
-            if event.title not in [e.title for e in self.world.events]:
-                # Generate TTS audio for new events with world agent voice
-                event_text = f"Breaking news: {event.title}. {event.description}"
-                event.audio_base64 = synthesize_tts(event_text, speaker="world_agent")
-                self.world.events.append(event)
-                self.spawned += 1
+            title = event.title.lower()
+            if title not in seen:
+                seen.add(title)
+                fresh.append(event)
+        # Generate TTS audio for all new events at once with the world agent voice
+        clips = synthesize_tts_batch(
+            (f"Breaking news: {event.title}. {event.description}", "world_agent") for event in fresh
+        )
+        for event, audio_base64 in zip(fresh, clips):
+            event.audio_base64 = audio_base64
+            if audio_base64:
+                self._audio_seq += 1
+                event.audio_id = f"a{self._audio_seq}"
+            self.world.add_event(event)
+            self.spawned += 1
+        self._touch("events")
+
+    @staticmethod
+    def _event_summary(e: Event) -> dict:
+        # Clients fetch the clip once from /api/audio instead
+        d = e.to_dict()
+        d["has_audio"] = e.audio_id is not None
+        d["audio_id"] = e.audio_id
+        return d
+
+    def event_audio(self, audio_id: str) -> Optional[bytes]:
+        for e in self.world.events:
+            if e.audio_id == audio_id:
+                return base64.b64decode(e.audio_base64)
+        return None
+
+    def meeting_audio(self, number: int) -> Optional[bytes]:
+        if self._meeting_audio and self._meeting_audio[0] == number and self._meeting_audio[1]:
+            return base64.b64decode(self._meeting_audio[1])
+        return None
+
+    def _touch(self, *keys: str):
+        """Mark parts of the cached world state stale after mutating them"""
+        self._dirty.update(keys)
 
     def get_world_state(self):
+        dirty, self._dirty = self._dirty, set()
+        for k, c in self.world.countries.items():
+            if f"country:{k}" in dirty:
+                self._country_state[k] = c.to_dict()
+        if "events" in dirty:
+            self._event_state = [self._event_summary(e) for e in self.world.events]
         return {
-            "countries": {k: {
-                "code": c.code,
-                "leader": asdict(c.leader),
-                "relationships": c.relationships
-            } for k, c in self.world.countries.items()},
-            "events": [asdict(e) for e in self.world.events],
+            "countries": dict(self._country_state),
+            "events": list(self._event_state),
             "meeting_number": self.world.meeting_number
         }
 
-    def conduct_round(self, selected_event_ids: List[str], round_num: int, player_message: str = None):
+    def speak_round(self, focus_events: List[Event], rnd: int) -> Dict[str, str]:
+        """Voice every leader with one Claude call; returns {country_code: speech}"""
+        event_titles = "; ".join(e.title for e in focus_events)
+        personas = "\n\n".join(agent.persona() for agent in self.leaders.values())
+        talks = "\n".join(
+            f"  {speaker or 'UN Secretary-General'}: {text}" for speaker, text in self.memory.recent
+        ) or "  (nothing yet)"
+        # Most stable text first: personas only move after a meeting, the digest every few turns
+        prompt = [SystemMessage(content=ROUND_PREAMBLE + personas)]
+        if self.memory.summary:
+            prompt.append(SystemMessage(content=f"Earlier in these talks: {self.memory.summary}"))
+        prompt.append(HumanMessage(
+            content=f"Recent talks:\n{talks}\n\n"
+            f"Round {rnd}: Headlines → {event_titles}. Respond in ≤3 sentences per leader."
+        ))
+        try:
+            raw = cached_invoke(prompt, sampled=True)
+            replies = extract_json(raw)
+        except Exception:
+            replies = {}
+
+        speeches = {}
+        missing = []
+        for code in self.leaders:
+            reply = replies.get(code)
+            if isinstance(reply, str) and reply.strip():
+                speeches[code] = reply.strip()
+            else:
+                missing.append(code)
+
+        # Any leader the batched reply skipped gets its own call
+        fallback = LLM_POOL.map(lambda c: self.leaders[c].speak(focus_events, rnd), missing)
+        speeches.update(zip(missing, fallback))
+        return {code: speeches[code] for code in self.leaders}
+
+    def _leader_response(self, code: str, speech: str) -> dict:
+        leader = self.world.countries[code].leader
+        return {
+            "speaker": f"{leader.name} ({leader.dominant_trait})",
+            "content": speech,
+            "type": "leader",
+            "country": code,
+            # TTS audio with the country-specific voice
+            "audio_base64": synthesize_tts(speech, speaker=f"leader_{code}")
+        }
+
+    def iter_round(
+        self, selected_event_ids: List[str], round_num: int, player_message: str = None, in_order: bool = False
+    ) -> Iterator[dict]:
+        """Run a round, yielding each response once its audio is ready (leader order if in_order).
+
+        All session state is updated before the first yield.
+        """
         selected_events = [e for e in self.world.events if e.eid in selected_event_ids]
         
-        responses = []
-        
         # Leaders speak
-        for code, agent in self.leaders.items():
-            speech = agent.speak(selected_events, round_num)
-            leader = self.world.countries[code].leader
-            dominant_trait = max(leader.traits.items(), key=lambda x: x[1])[0]
-            
-            # Generate TTS audio for leader response with country-specific voice
-            speaker_key = f"leader_{code}"
-            audio_base64 = synthesize_tts(speech, speaker=speaker_key)
-            
-            response = {
-                "speaker": f"{leader.name} ({dominant_trait})",
-                "content": speech,
-                "type": "leader",
-                "country": code,
-                "audio_base64": audio_base64
-            }
-            responses.append(response)
-            
-            # Add to other leaders' memory
-            for other_code, other_agent in self.leaders.items():
-                if other_code != code:
-                    other_agent.memory.append(("user", f"{leader.name} said: {speech}"))
-            
-            self.transcript.append(f"{leader.name}: {speech}")
+        speeches = self.speak_round(selected_events, round_num)
+
+        turns = [(self.world.countries[code].leader.name, speech) for code, speech in speeches.items()]
+        self.transcript.extend(f"{name}: {speech}" for name, speech in turns)
+        # One shared record of the talks; each leader reads it from its own side
+        self.memory.extend(turns)
 
         # Player message
         if player_message:
-            responses.append({
+            self.memory.append(("", player_message))
+                
+            self.transcript.append(f"PLAYER: {player_message}")
+
+        # Synthesize every leader's audio at once
+        futures = [TTS_POOL.submit(self._leader_response, code, speech) for code, speech in speeches.items()]
+        for future in (futures if in_order else as_completed(futures)):
+            yield future.result()
+
+        if player_message:
+            yield {
                 "speaker": "UN Secretary-General",
                 "content": player_message,
                 "type": "player"
-            })
-            
-            # Add to all leaders' memory
-            for agent in self.leaders.values():
-                agent.memory.append(("user", player_message))
-                
-            self.transcript.append(f"PLAYER: {player_message}")
+            }
 
-        return responses
+    def conduct_round(self, selected_event_ids: List[str], round_num: int, player_message: str = None):
+        return list(self.iter_round(selected_event_ids, round_num, player_message, in_order=True))
 
     def end_meeting(self, selected_event_ids: List[str]):
         # Mark selected events as addressed
         for event in self.world.events:
             if event.eid in selected_event_ids:
                 event.addressed = True
+        self._touch("events")
 
         # Analyze meeting outcomes
         transcript_text = "\n".join(self.transcript)
@@ -451,28 +948,35 @@ class GameSession:
         summary = outcomes.get("summary", "Meeting concluded with mixed outcomes.")
         audio_base64 = synthesize_tts(summary, speaker="world_agent")
         outcomes["audio_base64"] = audio_base64
+        outcomes["meeting_number"] = self.world.meeting_number
+        self._meeting_audio = (self.world.meeting_number, audio_base64)
         
         # Apply stat changes
         stat_changes = outcomes.get("stat_changes", {})
+        countries = self.world.countries
         for country_code, changes in stat_changes.items():
-            if country_code in self.world.countries:
-                leader = self.world.countries[country_code].leader
-                leader.econ_power = max(0.1, min(1.0, leader.econ_power + changes.get("econ", 0)))
-                leader.war_power = max(0.1, min(1.0, leader.war_power + changes.get("war", 0)))
+            if country_code in countries:
+                leader = countries[country_code].leader
+                leader.econ_power = clamp(leader.econ_power + changes.get("econ", 0), 0.1, 1.0)
+                leader.war_power = clamp(leader.war_power + changes.get("war", 0), 0.1, 1.0)
                 leader.population = max(1, leader.population + int(changes.get("pop", 0)))
+                self._touch(f"country:{country_code}")
 
         # Apply relationship changes
         rel_changes = outcomes.get("relationship_changes", [])
         for a, b, delta in rel_changes:
-            if a in self.world.countries and b in self.world.countries[a].relationships:
-                new_rel = max(0.0, min(1.0, self.world.countries[a].relationships[b] + delta))
-                self.world.countries[a].relationships[b] = new_rel
-                self.world.countries[b].relationships[a] = new_rel
+            if a in countries and b in countries[a].relationships:
+                new_rel = clamp(countries[a].relationships[b] + delta, 0.0, 1.0)
+                countries[a].relationships[b] = new_rel
+                countries[b].relationships[a] = new_rel
+                self.leaders[a].invalidate()
+                self.leaders[b].invalidate()
+                self._touch(f"country:{a}", f"country:{b}")
 
         # Check for event resolution
         selected_events = [e for e in self.world.events if e.eid in selected_event_ids]
         for evt in selected_events:
-            if self.resolution.decide(evt, transcript_text) and evt.cycles_alive > 0:
+            if evt.cycles_alive > 0 and self.resolution.decide(evt, transcript_text):
                 evt.resolved = True
                 self.resolved += 1
 
@@ -483,29 +987,34 @@ class GameSession:
 
     def time_skip(self):
         # Evolve events
-        for evt in list(self.world.events):
+        for evt in self.world.events:
             evt.cycles_alive += 1
-            self.event_agent.evolve(evt, self.world)
-            if evt.resolved:
-                self.world.events.remove(evt)
+        self.event_agent.evolve_all(self.world.events, self.world)
+        self.world.set_events([evt for evt in self.world.events if not evt.resolved])
 
         # Generate new events if needed
         if len(self.world.events) < 3:
-            new_events = self.event_agent.generate_multiple(self.world)
-            for event in new_events:
-                if event.title not in [e.title for e in self.world.events]:
-                    # Generate TTS audio for new events with world agent voice
-                    event_text = f"Breaking news: {event.title}. {event.description}"
-                    event.audio_base64 = synthesize_tts(event_text, speaker="world_agent")
-                    self.world.events.append(event)
-                    self.spawned += 1
+            self._add_events(self.event_agent.generate_multiple(self.world))
 
         # Reset addressed status
         for event in self.world.events:
             event.addressed = False
+        self._touch("events")
+
+# Live game sessions; a game is dropped after SESSION_TTL seconds without a request,
+# or as the least recently used once MAX_SESSIONS is reached
+MAX_SESSIONS = int(os.getenv("MAX_SESSIONS", "256"))
+SESSION_TTL = int(os.getenv("SESSION_TTL", "3600"))
+game_sessions: TTLCache = TTLCache(maxsize=MAX_SESSIONS, ttl=SESSION_TTL, timer=time.monotonic)
+_sessions_lock = threading.Lock()
 
-# Global game sessions storage (in production, use proper session management)
-game_sessions = {}
+def get_session(session_id: Optional[str]) -> Optional[GameSession]:
+    with _sessions_lock:
+        session = game_sessions.get(session_id)
+        if session is not None:
+            # Re-inserting restarts the idle timer
+            game_sessions[session_id] = session
+        return session
 
 # ───── API Routes ─────
 
@@ -576,17 +1085,8 @@ def tts_synthesize():
         # Set up the text input
         synthesis_input = texttospeech.SynthesisInput(text=text)
         
-        # Build the voice request
-        voice = texttospeech.VoiceSelectionParams(
-            language_code=language_code,
-            name=voice_name
-        )
-        
-        # Select the type of audio file to return
-        audio_config = texttospeech.AudioConfig(
-            audio_encoding=texttospeech.AudioEncoding.MP3,
-            speaking_rate=speaking_rate
-        )
+        # Build the voice request and audio format (cached per voice/language/rate)
+        voice, audio_config = tts_config(voice_name, language_code, speaking_rate)
         
         # Perform the text-to-speech request
         response = tts_client.synthesize_speech(
@@ -642,14 +1142,39 @@ def serve_static(filename):
         return send_from_directory('.', filename)
     return "File not found", 404
 
+@app.route('/api/audio/<session_id>/<audio_id>', methods=['GET'])
+def event_audio(session_id, audio_id):
+    """MP3 narration for one event, kept out of the world state so it is downloaded once"""
+    session = get_session(session_id)
+    if session is None:
+        return jsonify({"error": "Invalid session"}), 400
+    # No session lock: the clip never changes once set, and a round in progress shouldn't hold it up
+    audio = session.event_audio(audio_id)
+    if audio is None:
+        return jsonify({"error": "No audio for this event"}), 404
+    return Response(audio, mimetype="audio/mpeg", headers={"Cache-Control": "private, max-age=3600"})
+
+@app.route('/api/audio/<session_id>/meeting/<int:number>', methods=['GET'])
+def meeting_audio(session_id, number):
+    """MP3 summary of the latest meeting's outcomes, for clients that asked for an audio_url"""
+    session = get_session(session_id)
+    if session is None:
+        return jsonify({"error": "Invalid session"}), 400
+    audio = session.meeting_audio(number)
+    if audio is None:
+        return jsonify({"error": "No audio for this meeting"}), 404
+    return Response(audio, mimetype="audio/mpeg", headers={"Cache-Control": "private, max-age=3600"})
+
 @app.route('/api/new-game', methods=['POST'])
 def new_game():
-    session_id = str(int(time.time() * 1000))  # Simple session ID
-    game_sessions[session_id] = GameSession()
+    session_id = uuid.uuid4().hex
+    session = GameSession()
+    with _sessions_lock:
+        game_sessions[session_id] = session
     
     return jsonify({
         "session_id": session_id,
-        "world_state": game_sessions[session_id].get_world_state()
+        "world_state": session.get_world_state()
     })
 
 @app.route('/api/conduct-round', methods=['POST'])
@@ -659,33 +1184,69 @@ def conduct_round():
     selected_event_ids = data.get('selected_event_ids', [])
     round_num = data.get('round_num', 1)
     player_message = data.get('player_message', '')
+    # False: the caller only wants an acknowledgement, so neither the replies (with their
+    # TTS clips) nor the world state snapshot are sent back
+    include_world_state = data.get('include_world_state', True)
     
-    if session_id not in game_sessions:
+    session = get_session(session_id)
+    if session is None:
         return jsonify({"error": "Invalid session"}), 400
     
-    session = game_sessions[session_id]
-    responses = session.conduct_round(selected_event_ids, round_num, player_message)
+    with session.lock:
+        responses = session.conduct_round(selected_event_ids, round_num, player_message)
+        if not include_world_state:
+            return jsonify({"ok": True})
+        world_state = session.get_world_state()
     
     return jsonify({
         "responses": responses,
-        "world_state": session.get_world_state()
+        "world_state": world_state
     })
 
+@app.route('/api/conduct-round/stream', methods=['POST'])
+def conduct_round_stream():
+    """conduct-round as NDJSON: one {"response": ...} line per speaker as soon as it is ready,
+    then a final {"world_state": ...} line"""
+    data = request.json
+    session_id = data.get('session_id')
+    selected_event_ids = data.get('selected_event_ids', [])
+    round_num = data.get('round_num', 1)
+    player_message = data.get('player_message', '')
+    
+    session = get_session(session_id)
+    if session is None:
+        return jsonify({"error": "Invalid session"}), 400
+
+    def generate():
+        with session.lock:
+            for response in session.iter_round(selected_event_ids, round_num, player_message):
+                yield orjson.dumps({"response": response}) + b"\n"
+            yield orjson.dumps({"world_state": session.get_world_state()}, option=orjson.OPT_NON_STR_KEYS) + b"\n"
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
 @app.route('/api/end-meeting', methods=['POST'])
 def end_meeting():
     data = request.json
     session_id = data.get('session_id')
     selected_event_ids = data.get('selected_event_ids', [])
+    # "url" returns audio_url in place of the inline audio_base64 clip
+    audio_mode = data.get('audio', 'base64')
     
-    if session_id not in game_sessions:
+    session = get_session(session_id)
+    if session is None:
         return jsonify({"error": "Invalid session"}), 400
     
-    session = game_sessions[session_id]
-    outcomes = session.end_meeting(selected_event_ids)
+    with session.lock:
+        outcomes = session.end_meeting(selected_event_ids)
+        world_state = session.get_world_state()
+    
+    if audio_mode == 'url' and outcomes.pop("audio_base64", None):
+        outcomes["audio_url"] = f"/api/audio/{session_id}/meeting/{outcomes['meeting_number']}"
     
     return jsonify({
         "outcomes": outcomes,
-        "world_state": session.get_world_state()
+        "world_state": world_state
     })
 
 @app.route('/api/time-skip', methods=['POST'])
@@ -693,54 +1254,58 @@ def time_skip():
     data = request.json
     session_id = data.get('session_id')
     
-    if session_id not in game_sessions:
+    session = get_session(session_id)
+    if session is None:
         return jsonify({"error": "Invalid session"}), 400
     
-    session = game_sessions[session_id]
-    session.time_skip()
+    with session.lock:
+        session.time_skip()
+        world_state = session.get_world_state()
     
     return jsonify({
-        "world_state": session.get_world_state()
+        "world_state": world_state
     })
 
+ASSESSMENT_SYSTEM = SystemMessage(content=textwrap.dedent("""
+    You are a diplomatic analyst evaluating the performance of a UN Secretary-General in a crisis simulation.
+    Analyze the diplomatic outcomes, relationships between countries, and overall world stability.
+    Provide a comprehensive assessment in 3-4 paragraphs covering:
+    1. Diplomatic effectiveness and relationship management
+    2. Crisis resolution and event handling
+    3. Overall impact on world stability
+    4. Specific strengths and areas for improvement
+    
+    Be constructive, specific, and diplomatic in your assessment.
+"""))
+
 @app.route('/api/generate-final-assessment', methods=['POST'])
 def generate_final_assessment():
     """Generate AI assessment of player's diplomatic performance"""
     data = request.json
     session_id = data.get('session_id')
     
-    if session_id not in game_sessions:
+    session = get_session(session_id)
+    if session is None:
         return jsonify({"error": "Invalid session"}), 400
     
-    session = game_sessions[session_id]
-    
     try:
         # Prepare context for assessment
-        context = {
-            "world_state": session.get_world_state(),
-            "meeting_number": session.world.meeting_number,
-            "events_spawned": session.spawned,
-            "events_resolved": session.resolved,
-            "transcript": session.transcript
-        }
+        with session.lock:
+            context = {
+                "world_state": session.get_world_state(),
+                "meeting_number": session.world.meeting_number,
+                "events_spawned": session.spawned,
+                "events_resolved": session.resolved,
+                "transcript": list(session.transcript)
+            }
         
         # Generate assessment using Claude AI
         assessment_prompt = [
-            SystemMessage(content=textwrap.dedent("""
-                You are a diplomatic analyst evaluating the performance of a UN Secretary-General in a crisis simulation.
-                Analyze the diplomatic outcomes, relationships between countries, and overall world stability.
-                Provide a comprehensive assessment in 3-4 paragraphs covering:
-                1. Diplomatic effectiveness and relationship management
-                2. Crisis resolution and event handling
-                3. Overall impact on world stability
-                4. Specific strengths and areas for improvement
-                
-                Be constructive, specific, and diplomatic in your assessment.
-            """)),
-            HumanMessage(content=json.dumps(context))
+            ASSESSMENT_SYSTEM,
+            HumanMessage(content=dumps(context))
         ]
         
-        assessment = llm.invoke(assessment_prompt).content.strip()
+        assessment = guarded_invoke(assessment_prompt).content.strip()
         
         return jsonify({
             "assessment": assessment
@@ -4,38 +4,27 @@ Text-based interface for UN Diplomatic Simulation
 Uses message.txt as the UI while maintaining all TTS and game functionalities
 """
 
+import orjson
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
 import os
 import sys
-from datetime import datetime
+import atexit
+from contextlib import contextmanager
 
-class TextInterface:
-    def __init__(self, server_url="http://localhost:5001"):
-        self.server_url = server_url
-        self.session_id = None
-        self.world_state = None
-        self.is_in_meeting = False
-        self.current_round = 0
-        self.max_rounds = 3
-        self.selected_events = []
-        
-    def write_message(self, message, append=True):
-        """Write message to message.txt file"""
-        try:
-            if append:
-                with open('message.txt', 'a', encoding='utf-8') as f:
-                    f.write(f"\n{message}")
-            else:
-                with open('message.txt', 'w', encoding='utf-8') as f:
-                    f.write(message)
-        except Exception as e:
-            print(f"Error writing to message.txt: {e}")
-    
-    def clear_messages(self):
-        """Clear the message.txt file and write the header"""
-        header = """╔══════════════════════════════════════════════════════════════════════════════╗
+# (connect, read) seconds; a round can take a while to generate
+HTTP_TIMEOUT = (3, 120)
+STATUS_TIMEOUT = (3, 5)
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# message.txt is trimmed back to the header plus its most recent
+# LOG_KEEP_CHARS once it grows past LOG_MAX_CHARS
+LOG_MAX_CHARS = 4_000_000
+LOG_KEEP_CHARS = 2_000_000
+
+_HEADER = """╔══════════════════════════════════════════════════════════════════════════════╗
 ║                    🌍 UN DIPLOMATIC SIMULATION SYSTEM                        ║
 ║                              Text Interface                                  ║
 ╚══════════════════════════════════════════════════════════════════════════════╝
@@ -96,22 +85,205 @@ Ready to begin diplomatic negotiations...
 Type 'START' to begin or 'HELP' for detailed instructions.
 
 ══════════════════════════════════════════════════════════════════════════════════"""
-        self.write_message(header, append=False)
+
+_HELP_TEXT = """
+══════════════════════════════════════════════════════════════════════════════════
+📖 DETAILED HELP:
+
+🚀 GAME CONTROL:
+   START          - Begin a new diplomatic simulation
+   STATUS         - Show current world status and leaders
+   TIME           - Advance time by 6 months
+
+🏛️ MEETING CONTROL:
+   SELECT <ID>    - Select/deselect event for meeting (e.g., SELECT E1)
+   MEETING        - Start diplomatic meeting with selected events
+   RESPOND <MSG>  - Send diplomatic message (e.g., RESPOND We must cooperate)
+   SKIP           - Skip your turn
+   NEXT           - Move to next round
+   END            - End current meeting
+
+ℹ️ UTILITY:
+   HELP           - Show this help message
+   QUIT           - Exit the simulation
+
+🔊 TTS FEATURES:
+   • All leader responses generate natural speech
+   • Event announcements with TTS narration
+   • Meeting outcomes with voice summaries
+   • Audio is queued and plays sequentially
+
+💡 GAME FLOW:
+   1. START → Begin simulation
+   2. STATUS → Review world situation
+   3. SELECT → Choose events to address
+   4. MEETING → Start negotiations
+   5. RESPOND → Send diplomatic messages
+   6. NEXT → Continue through rounds
+   7. END → Conclude meeting
+   8. TIME → Advance world timeline
+══════════════════════════════════════════════════════════════════════════════════"""
+
+def _json(response):
+    """Decode a JSON response body with orjson"""
+    return orjson.loads(response.content)
+
+class TextInterface:
+    _EMOJI_MAP = {
+        "world-agent": "🌍",
+        "leader": "👑",
+        "player": "🕊️",
+        "info": "ℹ️",
+        "error": "❌",
+        "success": "✅",
+        "event": "⚡",
+        "system": "🔧"
+    }
+    
+    def __init__(self, server_url="http://localhost:5001"):
+        self.server_url = server_url
+        self.session_id = None
+        self._world_state = None
+        self._event_ids = set()
+        self.is_in_meeting = False
+        self.current_round = 0
+        self.max_rounds = 3
+        # Sent sorted so identical selections give identical request bodies
+        self.selected_events = set()
+        self._log_fh = None
+        atexit.register(self._close_log)
+        self._pending = None
+        self._log_chars = 0
+        self._status_source = None
+        self._status_lines = []
+        self._ts_sec = None
+        self._ts_str = ""
+        
+        # One keep-alive session for every call to the game server
+        self.http = requests.Session()
+        # Retry refused/dropped connections for any call; status retries only for
+        # GET, since re-posting a round or meeting end would run it twice
+        retry = Retry(total=2, connect=2, backoff_factor=0.3,
+                      status_forcelist=[502, 503, 504], allowed_methods=["GET"])
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry)
+        self.http.mount("http://", adapter)
+        self.http.mount("https://", adapter)
+        
+        # Command dispatch tables for run()
+        self._commands = {
+            "START": self.start_new_game,
+            "MEETING": self.start_meeting,
+            "SKIP": self.skip_turn,
+            "NEXT": self.next_round,
+            "END": self.end_meeting,
+            "TIME": self.time_skip,
+            "STATUS": self.display_world_status,
+            "HELP": self.show_help,
+        }
+        self._arg_commands = {
+            "RESPOND": self.send_player_message,
+            "SELECT": self.select_event,
+        }
+        
+    @property
+    def world_state(self):
+        """Last world state received from the server"""
+        return self._world_state
+    
+    @world_state.setter
+    def world_state(self, world_state):
+        self._world_state = world_state
+        self._event_ids = {e['eid'] for e in world_state['events']} if world_state else set()
+    
+    def write_message(self, message, append=True):
+        """Write message to message.txt file"""
+        text = f"\n{message}" if append else message
+        if append and self._pending is not None:
+            self._pending.append(text)
+            return
+        self._write(text, append)
+    
+    def _write(self, text, append=True):
+        """Write text through the persistent message.txt handle"""
+        try:
+            if not append or self._log_fh is None:
+                self._open_log('a' if append else 'w')
+            self._log_fh.write(text)
+            self._log_fh.flush()
+            self._log_chars += len(text)
+            if self._log_chars > LOG_MAX_CHARS:
+                self._trim_log()
+        except Exception as e:
+            print(f"Error writing to message.txt: {e}")
+    
+    @contextmanager
+    def batched_writes(self):
+        """Collect appended messages and write them to message.txt in one go"""
+        if self._pending is not None:
+            yield
+            return
+        self._pending = []
+        try:
+            yield
+        finally:
+            chunks, self._pending = self._pending, None
+            if chunks:
+                self._write("".join(chunks))
+    
+    def _open_log(self, mode):
+        """(Re)open the persistent message.txt handle"""
+        if self._log_fh is not None:
+            self._log_fh.close()
+            self._log_fh = None
+        if mode == 'w':
+            self._log_chars = 0
+        else:
+            # Counted in characters, like every write; only read when resuming an existing log
+            try:
+                with open('message.txt', 'r', encoding='utf-8') as f:
+                    self._log_chars = len(f.read())
+            except FileNotFoundError:
+                self._log_chars = 0
+        self._log_fh = open('message.txt', mode, encoding='utf-8', buffering=1)
+    
+    def _trim_log(self):
+        """Rewrite message.txt as the header plus its most recent lines"""
+        # Drop the handle first so a failed trim leaves _write to reopen it
+        self._log_fh.close()
+        self._log_fh = None
+        with open('message.txt', 'r', encoding='utf-8') as f:
+            tail = f.read()[-LOG_KEEP_CHARS:]
+        # Start on a line boundary so no message is cut in half
+        tail = tail[tail.find("\n") + 1:]
+        content = f"{_HEADER}\n\n   ... earlier messages trimmed ...\n{tail}"
+        with open('message.txt.tmp', 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace('message.txt.tmp', 'message.txt')
+        self._log_fh = open('message.txt', 'a', encoding='utf-8', buffering=1)
+        self._log_chars = len(content)
+    
+    def _close_log(self):
+        """Close the message.txt handle"""
+        if self._log_fh is not None:
+            self._log_fh.close()
+            self._log_fh = None
+    
+    def clear_messages(self):
+        """Clear the message.txt file and write the header"""
+        self.write_message(_HEADER, append=False)
+    
+    def _timestamp(self):
+        """HH:MM:SS for now, formatted once per second"""
+        sec = int(time.time())
+        if sec != self._ts_sec:
+            self._ts_str = time.strftime("%H:%M:%S", time.localtime(sec))
+            self._ts_sec = sec
+        return self._ts_str
     
     def log_message(self, speaker, content, msg_type="info"):
         """Log a message with timestamp and formatting"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        emoji_map = {
-            "world-agent": "🌍",
-            "leader": "👑", 
-            "player": "🕊️",
-            "info": "ℹ️",
-            "error": "❌",
-            "success": "✅",
-            "event": "⚡",
-            "system": "🔧"
-        }
-        emoji = emoji_map.get(msg_type, "💬")
+        timestamp = self._timestamp()
+        emoji = self._EMOJI_MAP.get(msg_type, "💬")
         
         # Format the message nicely
         if msg_type == "leader":
@@ -123,16 +295,24 @@ Type 'START' to begin or 'HELP' for detailed instructions.
         else:
             message = f"\n[{timestamp}] {emoji} {speaker}: {content}"
         
-        self.write_message(message)
-        
-        # Add TTS note if applicable
+        # Add TTS note if applicable, in the same write as the message
         if msg_type in ["leader", "event"]:
-            self.write_message(f"   🔊 [TTS audio generated]")
+            message += "\n   🔊 [TTS audio generated]"
+        
+        self.write_message(message)
+    
+    def _post(self, path, payload=None, **kwargs):
+        """POST an orjson-encoded payload to the game server"""
+        if payload is not None:
+            kwargs.setdefault('data', orjson.dumps(payload))
+            kwargs.setdefault('headers', JSON_HEADERS)
+        kwargs.setdefault('timeout', HTTP_TIMEOUT)
+        return self.http.post(f"{self.server_url}{path}", **kwargs)
     
     def check_server(self):
         """Check if server is running"""
         try:
-            response = requests.get(f"{self.server_url}/api/tts/status", timeout=5)
+            response = self.http.get(f"{self.server_url}/api/tts/status", timeout=STATUS_TIMEOUT)
             return response.status_code == 200
         except:
             return False
@@ -140,9 +320,9 @@ Type 'START' to begin or 'HELP' for detailed instructions.
     def start_new_game(self):
         """Start a new game session"""
         try:
-            response = requests.post(f"{self.server_url}/api/new-game")
+            response = self._post("/api/new-game")
             if response.status_code == 200:
-                data = response.json()
+                data = _json(response)
                 self.session_id = data['session_id']
                 self.world_state = data['world_state']
                 self.log_message("System", f"New diplomatic simulation started! Session ID: {self.session_id}", "success")
@@ -160,27 +340,40 @@ Type 'START' to begin or 'HELP' for detailed instructions.
         if not self.world_state:
             return
         
-        self.log_message("System", "══════════════════════════════════════════════════════════════════════════════════", "info")
-        self.log_message("System", "🏛️ WORLD LEADERS:", "info")
+        with self.batched_writes():
+            for speaker, content, msg_type in self._world_status_lines():
+                self.log_message(speaker, content, msg_type)
+    
+    def _world_status_lines(self):
+        """Format the status block, reusing it until world_state is replaced"""
+        if self._status_source is self.world_state:
+            return self._status_lines
+        
+        lines = [("System", "══════════════════════════════════════════════════════════════════════════════════", "info"),
+                 ("System", "🏛️ WORLD LEADERS:", "info")]
         
         # Display leaders with nice formatting
         for code, country in self.world_state['countries'].items():
             leader = country['leader']
-            dominant_trait = max(leader['traits'].items(), key=lambda x: x[1])[0]
-            self.log_message(f"Leader {code}", f"{leader['name']} ({dominant_trait}) - Economic Power: {leader['econ_power']:.2f}, Military Power: {leader['war_power']:.2f}, Population: {leader['population']/1000000:.1f}M", "leader")
+            dominant_trait = leader.get('dominant_trait') or max(leader['traits'].items(), key=lambda x: x[1])[0]
+            lines.append((f"Leader {code}", f"{leader['name']} ({dominant_trait}) - Economic Power: {leader['econ_power']:.2f}, Military Power: {leader['war_power']:.2f}, Population: {leader['population']/1000000:.1f}M", "leader"))
         
         # Display events
         if self.world_state['events']:
-            self.log_message("System", "⚡ CURRENT CRISES:", "info")
+            lines.append(("System", "⚡ CURRENT CRISES:", "info"))
             for event in self.world_state['events']:
                 status = "RESOLVED" if event['resolved'] else "ADDRESSED" if event['addressed'] else "ACTIVE"
                 status_emoji = "✅" if event['resolved'] else "🔄" if event['addressed'] else "⚠️"
-                self.log_message("Event", f"{status_emoji} {event['title']} ({status})", "event")
-                self.log_message("Event", f"   {event['description']}", "event")
+                lines.append(("Event", f"{status_emoji} {event['title']} ({status})", "event"))
+                lines.append(("Event", f"   {event['description']}", "event"))
         else:
-            self.log_message("System", "No active crises at this time.", "info")
+            lines.append(("System", "No active crises at this time.", "info"))
+        
+        lines.append(("System", "══════════════════════════════════════════════════════════════════════════════════", "info"))
         
-        self.log_message("System", "══════════════════════════════════════════════════════════════════════════════════", "info")
+        self._status_source = self.world_state
+        self._status_lines = lines
+        return lines
     
     def start_meeting(self):
         """Start a diplomatic meeting"""
@@ -204,26 +397,28 @@ Type 'START' to begin or 'HELP' for detailed instructions.
             return False
         
         try:
-            response = requests.post(f"{self.server_url}/api/conduct-round", json={
+            # Log each leader as soon as the server streams their line
+            with self._post("/api/conduct-round/stream", {
                 'session_id': self.session_id,
-                'selected_event_ids': self.selected_events,
+                'selected_event_ids': sorted(self.selected_events),
                 'round_num': self.current_round
-            })
-            
-            if response.status_code == 200:
-                data = response.json()
-                self.world_state = data['world_state']
+            }, stream=True) as response:
+                if response.status_code != 200:
+                    self.log_message("System", "Failed to conduct round", "error")
+                    return False
                 
-                # Display leader responses
-                for resp in data['responses']:
-                    if resp['type'] == 'leader':
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    item = orjson.loads(line)
+                    if 'world_state' in item:
+                        self.world_state = item['world_state']
+                    elif item['response']['type'] == 'leader':
+                        resp = item['response']
                         self.log_message(resp['speaker'], resp['content'], "leader")
-                
-                self.log_message("System", "Your turn to respond, Secretary-General. Use RESPOND <message> to speak.", "world-agent")
-                return True
-            else:
-                self.log_message("System", "Failed to conduct round", "error")
-                return False
+            
+            self.log_message("System", "Your turn to respond, Secretary-General. Use RESPOND <message> to speak.", "world-agent")
+            return True
         except Exception as e:
             self.log_message("System", f"Error conducting round: {e}", "error")
             return False
@@ -237,16 +432,15 @@ Type 'START' to begin or 'HELP' for detailed instructions.
         self.log_message("UN Secretary-General", message, "player")
         
         try:
-            response = requests.post(f"{self.server_url}/api/conduct-round", json={
+            response = self._post("/api/conduct-round", {
                 'session_id': self.session_id,
-                'selected_event_ids': self.selected_events,
+                'selected_event_ids': sorted(self.selected_events),
                 'round_num': self.current_round,
-                'player_message': message
+                'player_message': message,
+                'include_world_state': False
             })
             
-            if response.status_code == 200:
-                data = response.json()
-                self.world_state = data['world_state']
+            if response.status_code == 200 and _json(response).get('ok'):
                 self.log_message("System", "Message delivered. The leaders are considering your diplomatic response.", "world-agent")
                 return True
             else:
@@ -256,6 +450,10 @@ Type 'START' to begin or 'HELP' for detailed instructions.
             self.log_message("System", f"Error sending message: {e}", "error")
             return False
     
+    def skip_turn(self):
+        """Skip the player's turn"""
+        self.log_message("System", "Turn skipped", "info")
+    
     def next_round(self):
         """Move to next round"""
         if not self.is_in_meeting:
@@ -275,25 +473,27 @@ Type 'START' to begin or 'HELP' for detailed instructions.
             return False
         
         try:
-            response = requests.post(f"{self.server_url}/api/end-meeting", json={
+            response = self._post("/api/end-meeting", {
                 'session_id': self.session_id,
-                'selected_event_ids': self.selected_events
+                'selected_event_ids': sorted(self.selected_events),
+                'audio': 'url'
             })
             
             if response.status_code == 200:
-                data = response.json()
+                data = _json(response)
                 self.world_state = data['world_state']
                 outcomes = data['outcomes']
                 
-                self.log_message("System", "🏛️ MEETING ADJOURNED - Analyzing diplomatic outcomes...", "world-agent")
-                self.log_message("Meeting Analysis", outcomes.get('summary', 'No summary available'), "world-agent")
-                
-                if outcomes.get('audio_base64'):
-                    self.log_message("System", "🔊 [TTS audio generated for meeting outcomes]", "info")
+                with self.batched_writes():
+                    self.log_message("System", "🏛️ MEETING ADJOURNED - Analyzing diplomatic outcomes...", "world-agent")
+                    self.log_message("Meeting Analysis", outcomes.get('summary', 'No summary available'), "world-agent")
+                    
+                    if outcomes.get('audio_url'):
+                        self.log_message("System", f"🔊 [TTS audio generated for meeting outcomes: {self.server_url}{outcomes['audio_url']}]", "info")
                 
                 self.is_in_meeting = False
                 self.current_round = 0
-                self.selected_events = []
+                self.selected_events = set()
                 return True
             else:
                 self.log_message("System", "Failed to end meeting", "error")
@@ -309,16 +509,17 @@ Type 'START' to begin or 'HELP' for detailed instructions.
             return False
         
         try:
-            response = requests.post(f"{self.server_url}/api/time-skip", json={
+            response = self._post("/api/time-skip", {
                 'session_id': self.session_id
             })
             
             if response.status_code == 200:
-                data = response.json()
+                data = _json(response)
                 self.world_state = data['world_state']
-                self.log_message("System", "⏰ SIX MONTHS LATER...", "world-agent")
-                self.log_message("System", "The world situation has evolved. New challenges and opportunities await.", "world-agent")
-                self.display_world_status()
+                with self.batched_writes():
+                    self.log_message("System", "⏰ SIX MONTHS LATER...", "world-agent")
+                    self.log_message("System", "The world situation has evolved. New challenges and opportunities await.", "world-agent")
+                    self.display_world_status()
                 return True
             else:
                 self.log_message("System", "Failed to advance time", "error")
@@ -333,60 +534,22 @@ Type 'START' to begin or 'HELP' for detailed instructions.
             self.log_message("System", "No active game session", "error")
             return False
         
-        event_ids = [e['eid'] for e in self.world_state['events']]
-        if event_id not in event_ids:
+        if event_id not in self._event_ids:
             self.log_message("System", f"Event {event_id} not found", "error")
             return False
         
         if event_id in self.selected_events:
-            self.selected_events.remove(event_id)
+            self.selected_events.discard(event_id)
             self.log_message("System", f"Event {event_id} deselected for meeting", "info")
         else:
-            self.selected_events.append(event_id)
+            self.selected_events.add(event_id)
             self.log_message("System", f"Event {event_id} selected for meeting", "success")
         
         return True
     
     def show_help(self):
         """Show help information"""
-        help_text = """
-══════════════════════════════════════════════════════════════════════════════════
-📖 DETAILED HELP:
-
-🚀 GAME CONTROL:
-   START          - Begin a new diplomatic simulation
-   STATUS         - Show current world status and leaders
-   TIME           - Advance time by 6 months
-
-🏛️ MEETING CONTROL:
-   SELECT <ID>    - Select/deselect event for meeting (e.g., SELECT E1)
-   MEETING        - Start diplomatic meeting with selected events
-   RESPOND <MSG>  - Send diplomatic message (e.g., RESPOND We must cooperate)
-   SKIP           - Skip your turn
-   NEXT           - Move to next round
-   END            - End current meeting
-
-ℹ️ UTILITY:
-   HELP           - Show this help message
-   QUIT           - Exit the simulation
-
-🔊 TTS FEATURES:
-   • All leader responses generate natural speech
-   • Event announcements with TTS narration
-   • Meeting outcomes with voice summaries
-   • Audio is queued and plays sequentially
-
-💡 GAME FLOW:
-   1. START → Begin simulation
-   2. STATUS → Review world situation
-   3. SELECT → Choose events to address
-   4. MEETING → Start negotiations
-   5. RESPOND → Send diplomatic messages
-   6. NEXT → Continue through rounds
-   7. END → Conclude meeting
-   8. TIME → Advance world timeline
-══════════════════════════════════════════════════════════════════════════════════"""
-        self.log_message("System", help_text, "info")
+        self.log_message("System", _HELP_TEXT, "info")
     
     def run(self):
         """Main interface loop"""
@@ -405,28 +568,16 @@ Type 'START' to begin or 'HELP' for detailed instructions.
                 if command == "QUIT":
                     self.log_message("System", "Exiting simulation. Thank you for your diplomatic service!", "info")
                     break
-                elif command == "START":
-                    self.start_new_game()
-                elif command == "MEETING":
-                    self.start_meeting()
-                elif command == "SKIP":
-                    self.log_message("System", "Turn skipped", "info")
-                elif command == "NEXT":
-                    self.next_round()
-                elif command == "END":
-                    self.end_meeting()
-                elif command == "TIME":
-                    self.time_skip()
-                elif command == "STATUS":
-                    self.display_world_status()
-                elif command == "HELP":
-                    self.show_help()
-                elif command.startswith("RESPOND "):
-                    message = command[8:]  # Remove "RESPOND " prefix
-                    self.send_player_message(message)
-                elif command.startswith("SELECT "):
-                    event_id = command[7:]  # Remove "SELECT " prefix
-                    self.select_event(event_id)
+                
+                handler = self._commands.get(command)
+                if handler:
+                    handler()
+                    continue
+                
+                head, _, arg = command.partition(" ")
+                handler = self._arg_commands.get(head)
+                if handler and arg:
+                    handler(arg)
                 else:
                     self.log_message("System", f"Unknown command: {command}. Type HELP for available commands.", "error")
                     